@@ -3,6 +3,7 @@
 __version__ = '0.1.0'
 
 from .local_threaded_executor import LocalThreadedExecutor
+from .local_async_executor import LocalAsyncExecutor
 from .memory import SQLiteMemory
 
-__all__ = ['LocalThreadedExecutor', 'SQLiteMemory']
\ No newline at end of file
+__all__ = ['LocalThreadedExecutor', 'LocalAsyncExecutor', 'SQLiteMemory']
\ No newline at end of file
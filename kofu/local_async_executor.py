@@ -0,0 +1,198 @@
+import asyncio
+from typing import Callable, List, Optional
+from tqdm import tqdm  # Import tqdm for progress bar
+from kofu.memory.sqlite_memory import SQLiteMemory  # Import SQLiteMemory
+from kofu.tasks import SimpleFn
+
+class LocalAsyncExecutor:
+    """
+    Asyncio-based sibling of LocalThreadedExecutor for I/O-bound tasks. A single
+    event loop with a semaphore can keep thousands of tasks in flight without the
+    per-thread stacks and context switches of a thread pool. Tasks must implement
+    `get_id()` and an async `__call__`. Memory updates run in a worker thread via
+    asyncio.to_thread so the event loop is never blocked on SQLite.
+    """
+
+    # Number of task completions buffered before they are committed to memory in one batch
+    status_batch_size = 32
+
+    def __init__(self, tasks: List, memory=None, path: Optional[str] = None, max_concurrency: int = 4, stop_all_when: Optional[Callable] = None, retry: int = 1):
+        """
+        Initialize the LocalAsyncExecutor.
+
+        :param tasks: List of task instances with an async __call__.
+        :param memory: Memory object (e.g., SQLiteMemory) to manage task states and results. If not provided, SQLiteMemory is used.
+        :param path: Optional path for SQLiteMemory storage. Required if memory is not provided.
+        :param max_concurrency: Maximum number of tasks in flight at once.
+        :param stop_all_when: Function that returns True if execution should stop (e.g., rate limiting, API blocks).
+        :param retry: Number of retries for each task in case of failure.
+        """
+        self.tasks = tasks
+        self.memory = memory
+        self.path = path
+        self.max_concurrency = max_concurrency
+        self.stop_all_when = stop_all_when
+        self._stopped = False
+        self.retry = retry
+
+        # Ensure memory is either provided or initialized
+        if self.memory is None:
+            if self.path is None:
+                raise ValueError("Either a memory instance or a path must be provided")
+            self.memory = SQLiteMemory(path=self.path)
+
+    def status_summary(self):
+        """
+        Print a summary of task statuses: pending, completed, failed.
+        """
+        pending = self.memory.get_pending_tasks()
+        completed = self.memory.get_completed_tasks()
+        failed = self.memory.get_failed_tasks()
+
+        print(f"Pending tasks: {len(pending)}")
+        print(f"Completed tasks: {len(completed)}")
+        print(f"Failed tasks: {len(failed)}")
+
+    def run(self):
+        """
+        Synchronous entry point: run the event loop until all tasks complete.
+        """
+        asyncio.run(self.run_async())
+
+    async def run_async(self):
+        """
+        Run the tasks concurrently on the event loop. Query memory for task status to
+        skip completed tasks and stop execution if the stop_all_when condition is met.
+        """
+        # Nothing to do at all: skip the database entirely
+        if not self.tasks:
+            print("No tasks to run.")
+            return
+
+        # Ensure all tasks are stored in memory before execution (idempotent)
+        self._initialize_tasks_in_memory()
+
+        # Cheap EXISTS probe before fetching any ids; avoids a scan per
+        # invocation in tight polling loops where everything is already done
+        if not self.memory.has_pending_tasks():
+            print("All tasks are already completed.")
+            return
+
+        # Retrieve pending tasks from memory, restricted to the tasks this
+        # executor owns so the DB does not return unrelated pending ids
+        task_ids = [task.get_id() for task in self.tasks]
+        pending_task_ids = set(self.memory.get_pending_tasks(filter_ids=task_ids))
+        tasks_to_run = [task for task in self.tasks if task.get_id() in pending_task_ids]
+
+        if not tasks_to_run:
+            print("All tasks are already completed.")
+            return
+
+        total_tasks = len(self.tasks)
+        completed_tasks = len(self.memory.get_completed_tasks())
+        failed_tasks = len(self.memory.get_failed_tasks())
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        futures = [asyncio.ensure_future(self._guarded_task(task, semaphore)) for task in tasks_to_run]
+
+        with tqdm(total=total_tasks, desc="Task Progress", unit="task", initial=completed_tasks + failed_tasks) as pbar:
+            status_batch = []
+            for future in asyncio.as_completed(futures):
+                task, result, error_info = await future
+
+                if error_info is None:
+                    status_batch.append((task.get_id(), 'completed', result, None))
+                    completed_tasks += 1
+                else:
+                    status_batch.append((task.get_id(), 'failed', None, error_info))
+                    failed_tasks += 1
+
+                if len(status_batch) >= self.status_batch_size:
+                    await asyncio.to_thread(self.memory.update_task_statuses, status_batch)
+                    status_batch = []
+
+                pbar.update(1)
+
+                # Check the stop condition after each task is processed. Stop
+                # conditions may inspect memory, so flush buffered statuses first
+                if self.stop_all_when:
+                    if status_batch:
+                        await asyncio.to_thread(self.memory.update_task_statuses, status_batch)
+                        status_batch = []
+                    if self.stop_all_when():
+                        print(f"Emergency stop condition met. Halting execution.")
+                        self._stopped = True
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        await asyncio.gather(*futures, return_exceptions=True)
+                        break
+
+            # Flush any statuses still buffered when the loop ends or stops early
+            if status_batch:
+                await asyncio.to_thread(self.memory.update_task_statuses, status_batch)
+
+        # Print status summary at the end
+        self.status_summary()
+
+    async def _guarded_task(self, task, semaphore):
+        """
+        Run one task under the concurrency semaphore, capturing its outcome so the
+        main loop can batch status updates without re-raising per task.
+        """
+        async with semaphore:
+            try:
+                result = await self._execute_task(task, self.retry)
+                return task, result, None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                exception_type = type(e).__name__
+                exception_message = str(e)
+                return task, None, f"{exception_type}: {exception_message}"
+
+    async def _execute_task(self, task, retries_left):
+        """
+        Execute the given task and return its result, retrying on failure.
+        """
+        if self._stopped:
+            raise RuntimeError("Execution was stopped by an external condition.")
+
+        try:
+            return await task()  # Try to execute the task
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if retries_left >= 1:
+                print(f"Retrying task {task.get_id()}... Attempts left: {retries_left-1}")
+                return await self._execute_task(task, retries_left - 1)
+            else:
+                raise e  # Raise the error if no retries are left
+
+    def _initialize_tasks_in_memory(self):
+        """
+        Ensure that all tasks are registered in the memory with a `pending` status if they are not already defined.
+        This method is idempotent and will not overwrite existing tasks.
+        """
+        task_definitions = []
+
+        for task in self.tasks:
+            task_id = task.get_id()
+            try:
+                # Check if the task already exists in memory
+                self.memory.get_task_status(task_id)
+            except KeyError:
+                if isinstance(task, SimpleFn):
+                    task_data = {
+                        "fn_name": task.fn.__name__,
+                        "args": task.args,
+                        "kwargs": task.kwargs
+                    }
+                else:
+                    task_data = {
+                        "task_type": type(task).__name__
+                    }
+
+                task_definitions.append((task_id, task_data))
+
+        if task_definitions:
+            self.memory.store_tasks(task_definitions)
@@ -1,11 +1,31 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from typing import Callable, List, Optional
 from tqdm import tqdm  # Import tqdm for progress bar
 from kofu.memory.sqlite_memory import SQLiteMemory  # Import SQLiteMemory
 from kofu.tasks import SimpleFn
 
+def _run_task(task, retries_left):
+    """
+    Execute a task, retrying on failure. Module-level so it can be pickled and
+    shipped to worker processes when a process pool is used.
+    """
+    try:
+        return task()
+    except Exception:
+        if retries_left >= 1:
+            print(f"Retrying task {task.get_id()}... Attempts left: {retries_left-1}")
+            return _run_task(task, retries_left - 1)
+        raise
+
 class LocalThreadedExecutor:
-    def __init__(self, tasks: List, memory=None, path: Optional[str] = None, max_concurrency: int = 4, stop_all_when: Optional[Callable] = None, retry: int = 1):
+    # Number of task completions buffered before they are committed to memory in one batch
+    status_batch_size = 32
+    # Checkpoint the WAL after this many committed batches so it cannot grow
+    # unboundedly during long runs; wal_autocheckpoint remains the safety net
+    checkpoint_every = 50
+
+    def __init__(self, tasks: List, memory=None, path: Optional[str] = None, max_concurrency: int = 4, stop_all_when: Optional[Callable] = None, retry: int = 1, executor_cls=ThreadPoolExecutor):
         """
         Initialize the LocalThreadedExecutor.
 
@@ -15,6 +35,11 @@ class LocalThreadedExecutor:
         :param max_concurrency: Maximum number of threads to run concurrently.
         :param stop_all_when: Function that returns True if execution should stop (e.g., rate limiting, API blocks).
         :param retry: Number of retries for each task in case of failure.
+        :param executor_cls: Pool class from concurrent.futures. Threads suit I/O-bound
+                             tasks; pass ProcessPoolExecutor for CPU-bound tasks so they
+                             scale across cores instead of contending on the GIL. Tasks
+                             must be picklable when a process pool is used; memory is
+                             only ever touched from the parent process.
         """
         self.tasks = tasks
         self.memory = memory
@@ -22,7 +47,15 @@ class LocalThreadedExecutor:
         self.max_concurrency = max_concurrency
         self.stop_all_when = stop_all_when
         self._stopped = False
+        # Set when execution halts; shared with tasks (as task.stop_event) so
+        # long-running task bodies can poll it and bail out early
+        self._stop_event = threading.Event()
         self.retry = retry  # Add retry parameter
+        self.executor_cls = executor_cls
+        # Persistent pool shared across run() invocations; created on first use
+        self._executor = None
+        # Set during run() when results are pre-serialized on pool threads
+        self._serialize = None
 
         # Ensure memory is either provided or initialized
         if self.memory is None:
@@ -47,11 +80,24 @@ class LocalThreadedExecutor:
         Run the tasks concurrently with a thread pool. Query memory for task status to skip completed tasks
         and stop execution if the stop_all_when condition is met.
         """
+        # Nothing to do at all: skip the database entirely
+        if not self.tasks:
+            print("No tasks to run.")
+            return
+
         # Ensure all tasks are stored in memory before execution (idempotent)
         self._initialize_tasks_in_memory()
 
-        # Retrieve pending tasks from memory
-        pending_task_ids = set(self.memory.get_pending_tasks())
+        # Cheap EXISTS probe before fetching any ids; avoids a scan per
+        # invocation in tight polling loops where everything is already done
+        if not self.memory.has_pending_tasks():
+            print("All tasks are already completed.")
+            return
+
+        # Retrieve pending tasks from memory, restricted to the tasks this
+        # executor owns so the DB does not return unrelated pending ids
+        task_ids = [task.get_id() for task in self.tasks]
+        pending_task_ids = set(self.memory.get_pending_tasks(filter_ids=task_ids))
         tasks_to_run = [task for task in self.tasks if task.get_id() in pending_task_ids]
 
         if not tasks_to_run:
@@ -65,45 +111,133 @@ class LocalThreadedExecutor:
 
         # Initialize progress bar
         with tqdm(total=total_tasks, desc="Task Progress", unit="task", initial=completed_tasks + failed_tasks) as pbar:
-            # Thread pool execution
-            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
-                future_to_task = {}
-                # Submit tasks to the executor one by one, checking stop condition before submitting
-                for task in tasks_to_run:
-                    if self._stopped or (self.stop_all_when and self.stop_all_when()):
-                        print(f"Stop condition met. Halting task submission.")
-                        self._stopped = True
-                        break
+            # Pool execution (threads by default, processes for CPU-bound tasks);
+            # the pool persists across run() calls so polling/retry loops do not
+            # pay thread startup each invocation
+            executor = self._get_executor()
+            # Worker processes cannot see self._stopped, so submit the bare
+            # module-level runner there; threads go through _execute_task
+            if isinstance(executor, ProcessPoolExecutor):
+                submit_target = _run_task
+            else:
+                submit_target = self._execute_task
+
+            # When memory accepts pre-serialized blobs, encode results on the
+            # pool threads instead of this loop, which would otherwise hold
+            # the GIL serializing large payloads while workers queue up
+            flush_statuses = self.memory.update_task_statuses
+            if submit_target is self._execute_task and hasattr(self.memory, 'update_task_statuses_raw'):
+                self._serialize = self.memory.serialize
+                flush_statuses = self.memory.update_task_statuses_raw
+
+            flushed_batches = 0
+            can_checkpoint = hasattr(self.memory, 'checkpoint')
+
+            def flush(batch):
+                nonlocal flushed_batches
+                flush_statuses(batch)
+                flushed_batches += 1
+                if can_checkpoint and flushed_batches % self.checkpoint_every == 0:
+                    # Checkpoint on a background thread so workers are not
+                    # stalled behind the WAL copy-back
+                    threading.Thread(target=self.memory.checkpoint, daemon=True).start()
+
+            future_to_task = {}
+            # Submit tasks to the executor one by one, checking stop condition before submitting
+            for task in tasks_to_run:
+                if self._stopped or (self.stop_all_when and self.stop_all_when()):
+                    print(f"Stop condition met. Halting task submission.")
+                    self._stop()
+                    break
+
+                # Events cannot be pickled into worker processes, so only
+                # thread-pool tasks get the shared stop event to poll
+                if submit_target is self._execute_task:
+                    task.stop_event = self._stop_event
+                future = executor.submit(submit_target, task, self.retry)
+                future_to_task[future] = task
+
+            # Collect results as tasks finish and update memory in batches,
+            # so N completions cost one transaction instead of N
+            status_batch = []
+            for future in as_completed(future_to_task):
+                task = future_to_task[future]
+                try:
+                    result = future.result()  # This will raise an exception if the task failed
+                    status_batch.append((task.get_id(), 'completed', result, None))
+                    completed_tasks += 1
+                except Exception as e:
+                    exception_type = type(e).__name__
+                    exception_message = str(e)
+                    error_info = f"{exception_type}: {exception_message}"
+                    if self._serialize is not None:
+                        error_info = self._serialize(error_info)
+                    status_batch.append((task.get_id(), 'failed', None, error_info))
+                    failed_tasks += 1
+
+                if len(status_batch) >= self.status_batch_size:
+                    flush(status_batch)
+                    status_batch = []
 
-                    future = executor.submit(self._execute_task, task, self.retry)
-                    future_to_task[future] = task
-
-                # Collect results as tasks finish and update memory
-                for future in as_completed(future_to_task):
-                    task = future_to_task[future]
-                    try:
-                        result = future.result()  # This will raise an exception if the task failed
-                        self.memory.update_task_statuses([(task.get_id(), 'completed', result, None)])
-                        completed_tasks += 1
-                    except Exception as e:
-                        exception_type = type(e).__name__
-                        exception_message = str(e)
-                        error_info = f"{exception_type}: {exception_message}"
-                        self.memory.update_task_statuses([(task.get_id(), 'failed', None, error_info)])
-                        failed_tasks += 1
-
-                    # Update progress bar
-                    pbar.update(1)
-
-                    # Check the stop condition after each task is processed
-                    if self.stop_all_when and self.stop_all_when():
+                # Update progress bar
+                pbar.update(1)
+
+                # Check the stop condition after each task is processed. Stop
+                # conditions may inspect memory, so flush buffered statuses first
+                if self.stop_all_when:
+                    if status_batch:
+                        flush(status_batch)
+                        status_batch = []
+                    if self.stop_all_when():
                         print(f"Emergency stop condition met. Halting execution.")
-                        self._stopped = True
+                        self._stop()
+                        # Cancel queued futures so they stay pending instead of
+                        # burning worker time after the stop was requested
+                        for pending_future in future_to_task:
+                            pending_future.cancel()
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        # The pool is unusable after shutdown; drop it so a
+                        # later run() starts a fresh one
+                        self._executor = None
                         break
 
+            # Flush any statuses still buffered when the loop ends or stops early
+            if status_batch:
+                flush(status_batch)
+
         # Print status summary at the end
         self.status_summary()
 
+    def _get_executor(self):
+        """
+        Return the persistent pool, creating it on first use or after close().
+        """
+        if self._executor is None:
+            self._executor = self.executor_cls(max_workers=self.max_concurrency)
+        return self._executor
+
+    def close(self):
+        """
+        Shut down the persistent pool, waiting for running tasks. The executor
+        remains usable; the next run() starts a fresh pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _stop(self):
+        """
+        Flag execution as stopped for the run loop and for any task polling the stop event.
+        """
+        self._stopped = True
+        self._stop_event.set()
+
     def _execute_task(self, task, retries_left):
         """
         Execute the given task and return its result.
@@ -111,15 +245,13 @@ class LocalThreadedExecutor:
         """
         if self._stopped:
             raise RuntimeError("Execution was stopped by an external condition.")
-        
-        try:
-            return task()  # Try to execute the task
-        except Exception as e:
-            if retries_left >= 1:
-                print(f"Retrying task {task.get_id()}... Attempts left: {retries_left-1}")
-                return self._execute_task(task, retries_left - 1)
-            else:
-                raise e  # Raise the error if no retries are left
+
+        result = _run_task(task, retries_left)
+        if self._serialize is not None:
+            # Encode on this pool thread so the result lands in the main loop
+            # as a ready-to-store blob
+            return self._serialize(result)
+        return result
 
     def _initialize_tasks_in_memory(self):
         """
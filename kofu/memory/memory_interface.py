@@ -21,10 +21,18 @@ class Memory(ABC):
         pass
 
     @abstractmethod
-    def get_pending_tasks(self) -> List[str]:
-        """Retrieve all tasks that are pending."""
+    def get_pending_tasks(self, filter_ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Retrieve all tasks that are pending. When filter_ids is given, only
+        pending tasks among those ids are returned.
+        """
         pass
     
+    @abstractmethod
+    def has_pending_tasks(self) -> bool:
+        """Return True if at least one task is pending, without listing them."""
+        pass
+
     @abstractmethod
     def get_completed_tasks(self) -> List[str]:
         """Retrieve all tasks that have been completed successfully."""
@@ -1,10 +1,55 @@
 import sqlite3
+import itertools
 import json
 import os
+import threading
+from urllib.parse import quote
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Tuple
 from .memory_interface import Memory
 from threading import Lock
 
+import msgpack
+
+# Payloads are stored as MessagePack BLOBs, which are 2-3x more compact than
+# JSON text and cheaper to (de)serialize. Each blob carries a one-byte format
+# version so the on-disk format can evolve; rows without the prefix are JSON
+# text written by older versions and are decoded transparently.
+_FORMAT_MSGPACK = b'\x01'
+
+def _dumps(obj):
+    return _FORMAT_MSGPACK + msgpack.packb(obj, use_bin_type=True)
+
+def _loads(data):
+    if isinstance(data, bytes) and data[:1] == _FORMAT_MSGPACK:
+        return msgpack.unpackb(data[1:], raw=False)
+    return json.loads(data)
+
+# Hot statements defined once at module level; combined with the enlarged
+# per-connection statement cache below, every call reuses a compiled
+# statement instead of re-parsing SQL text.
+_SQL_INSERT_DEFINITION = 'INSERT OR IGNORE INTO task_definition (task_id, task_data) VALUES (?, ?)'
+_SQL_INSERT_STATE = 'INSERT OR IGNORE INTO task_state (task_id, status) VALUES (?, ?)'
+_SQL_UPDATE_STATE = '''
+    UPDATE task_state
+    SET status = ?, result = COALESCE(?, result), error = COALESCE(?, error)
+    WHERE task_id = ?
+'''
+_SQL_GET_STATUS = 'SELECT status FROM task_state WHERE task_id = ?'
+_SQL_GET_RESULT = 'SELECT result FROM task_state WHERE task_id = ?'
+_SQL_GET_BY_STATUS = 'SELECT task_id FROM task_state WHERE status = ?'
+_SQL_GET_FAILED = "SELECT task_id, error FROM task_state WHERE status = 'failed' AND error IS NOT NULL"
+
+# Chunk size for IN (...) parameter lists, kept under SQLITE_MAX_VARIABLE_NUMBER
+_MAX_IN_PARAMS = 900
+
+# 8 KiB pages mean fewer page fetches (and mmap faults) when scanning rows that
+# carry multi-KB result blobs; only takes effect on newly created databases
+_PAGE_SIZE = 8192
+# Map the database file into the process so reads come straight from the OS page
+# cache instead of being copied into SQLite's pager
+_MMAP_SIZE = 2147483648
+
 class SQLiteMemory(Memory):
     def __init__(self, path: str):
         # Ensure the directory exists
@@ -12,64 +57,189 @@ class SQLiteMemory(Memory):
         if dir_path and not os.path.exists(dir_path):
             os.makedirs(dir_path, exist_ok=True)
 
-        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.path = path
+        self._is_memory = path == ':memory:'
+        # All writes go through one dedicated connection guarded by a lock; each
+        # reader thread gets its own lazily-opened connection so WAL can serve
+        # reads concurrently with a committing writer.
+        self._writer_conn = self._connect()
         self.lock = Lock()  # Use a lock to ensure thread safety for write operations
+        self._local = threading.local()
+        # Write-version counter backing the pending-tasks cache: every committed
+        # write bumps it, invalidating cached reads. Writes from other processes
+        # are not seen, so the cache only applies to a memory owned by one process.
+        self._version = 0
+        self._pending_cache = None  # (version, [task_id, ...])
+        self._configure_connection(self._writer_conn)
         self._setup_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a new connection. Every connection here is only ever used by one
+        thread at a time (the lock-guarded writer or a thread-local reader), so
+        file-backed databases are opened with nomutex=1 to skip SQLite's
+        per-call serialization mutex. In-memory databases keep the default
+        serialized mode since all threads share that single connection.
+        """
+        if self._is_memory:
+            return sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, cached_statements=512)
+        uri = 'file:' + quote(os.path.abspath(self.path)) + '?nomutex=1'
+        return sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None, cached_statements=512)
+
+    def _configure_connection(self, conn):
+        """
+        Apply performance PRAGMAs to a connection. WAL mode lets readers proceed while a
+        writer commits, and synchronous=NORMAL defers fsyncs to WAL checkpoints, which is
+        the dominant cost when many threads update task statuses concurrently.
+        """
+        # WAL and mmap only make sense for file-backed databases; page_size must
+        # be issued before the database (and its WAL journal) is first written
+        if not self._is_memory:
+            conn.execute(f'PRAGMA page_size={_PAGE_SIZE}')
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA wal_autocheckpoint=1000')
+            conn.execute(f'PRAGMA mmap_size={_MMAP_SIZE}')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-64000')
+        conn.execute('PRAGMA busy_timeout=5000')
+
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Return the calling thread's read connection, opening it lazily on first use.
+        In-memory databases are private to a single connection, so those fall back
+        to the shared writer connection.
+        """
+        if self._is_memory:
+            return self._writer_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._configure_connection(conn)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write_transaction(self):
+        """
+        Run a block of writes as a single transaction on the dedicated writer
+        connection, serialized by the writer lock.
+        """
+        with self.lock:
+            # BEGIN IMMEDIATE takes the write lock up front so the transaction
+            # cannot fail with SQLITE_BUSY after doing part of its work.
+            self._writer_conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._writer_conn
+            except BaseException:
+                self._writer_conn.execute('ROLLBACK')
+                raise
+            else:
+                self._writer_conn.execute('COMMIT')
+                self._version += 1
+
     def _setup_db(self):
-        with self.conn:
-            self.conn.execute('''
+        with self._write_transaction() as conn:
+            conn.execute('''
                 CREATE TABLE IF NOT EXISTS task_definition (
                     task_id TEXT PRIMARY KEY,
-                    task_data TEXT
-                )
-            ''')
-            self.conn.execute('''
-                CREATE TABLE IF NOT EXISTS task_status (
-                    task_id TEXT PRIMARY KEY,
-                    status TEXT,
-                    FOREIGN KEY(task_id) REFERENCES task_definition(task_id)
+                    task_data BLOB
                 )
             ''')
-            self.conn.execute('''
-                CREATE TABLE IF NOT EXISTS task_result (
+            # Status, result and error live in one row so every lookup is a single
+            # B-tree probe; WITHOUT ROWID clusters the row on task_id
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS task_state (
                     task_id TEXT PRIMARY KEY,
-                    result TEXT,
+                    status TEXT NOT NULL,
+                    result BLOB,
+                    error BLOB,
                     FOREIGN KEY(task_id) REFERENCES task_definition(task_id)
-                )
+                ) WITHOUT ROWID
             ''')
-            self.conn.execute('''
-                CREATE TABLE IF NOT EXISTS task_error (
-                    task_id TEXT PRIMARY KEY,
-                    error TEXT,
-                    FOREIGN KEY(task_id) REFERENCES task_definition(task_id)
-                )
+            # Covering index so status-filtered lookups (pending/completed/failed)
+            # are index-only searches instead of full-table scans
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_task_state_status ON task_state(status, task_id)
             ''')
+            self._migrate_legacy_tables(conn)
+
+    def _migrate_legacy_tables(self, conn):
+        """
+        Copy rows from the old task_status/task_result/task_error tables into
+        task_state and drop them. No-op for databases created on this schema.
+        """
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='task_status'")
+        if cursor.fetchone() is None:
+            return
+        conn.execute('''
+            INSERT OR IGNORE INTO task_state (task_id, status, result, error)
+            SELECT ts.task_id, ts.status, tr.result, te.error
+            FROM task_status ts
+            LEFT JOIN task_result tr ON ts.task_id = tr.task_id
+            LEFT JOIN task_error te ON ts.task_id = te.task_id
+        ''')
+        conn.execute('DROP TABLE task_status')
+        conn.execute('DROP TABLE IF EXISTS task_result')
+        conn.execute('DROP TABLE IF EXISTS task_error')
 
     def store_tasks(self, tasks: List[Tuple[str, dict]]):
         serialized_tasks = []
-        
+
         # Validate task data and prepare it for insertion
         for task_id, task_data in tasks:
             try:
-                json_data = json.dumps(task_data)  # Ensure it's JSON serializable
+                packed_data = _dumps(task_data)  # Ensure it's serializable
             except (TypeError, ValueError) as e:
-                raise TypeError(f"Task data for task {task_id} is not JSON serializable: {e}")
-            
-            serialized_tasks.append((task_id, json_data))
+                raise TypeError(f"Task data for task {task_id} is not serializable: {e}")
+
+            serialized_tasks.append((task_id, packed_data))
 
         # Use executemany for batch insertion
-        with self.conn, self.lock:
-            self.conn.executemany('INSERT OR IGNORE INTO task_definition (task_id, task_data) VALUES (?, ?)', serialized_tasks)
-            self.conn.executemany('INSERT OR IGNORE INTO task_status (task_id, status) VALUES (?, ?)', [(task_id, 'pending') for task_id, _ in tasks])
+        with self._write_transaction() as conn:
+            conn.executemany(_SQL_INSERT_DEFINITION, serialized_tasks)
+            conn.executemany(_SQL_INSERT_STATE, [(task_id, 'pending') for task_id, _ in tasks])
+
+    @staticmethod
+    def serialize(payload) -> bytes:
+        """
+        Serialize a result/error payload to the stored blob format. Callers can run
+        this off the main thread and hand the blobs to update_task_statuses_raw.
+        """
+        return _dumps(payload)
 
     def update_task_statuses(self, statuses: List[Tuple[str, str, Optional[dict], Optional[str]]]):
-        with self.conn, self.lock:
-            # Extract task_ids from the statuses list
-            task_ids = [task_id for task_id, _, _, _ in statuses]
-            
+        # One bulk statement updates status, result and error in a single row;
+        # COALESCE keeps the stored value when no new one is provided
+        rows = [
+            (
+                status,
+                _dumps(result) if result is not None else None,
+                _dumps(error) if error else None,
+                task_id,
+            )
+            for task_id, status, result, error in statuses
+        ]
+        self._apply_status_rows(rows)
+
+    def update_task_statuses_raw(self, statuses: List[Tuple[str, str, Optional[bytes], Optional[bytes]]]):
+        """
+        Like update_task_statuses, but result and error are blobs already produced
+        by serialize(), so no serialization work happens on the calling thread.
+        """
+        rows = [
+            (status, result, error, task_id)
+            for task_id, status, result, error in statuses
+        ]
+        self._apply_status_rows(rows)
+
+    def _apply_status_rows(self, rows: List[Tuple[str, Optional[bytes], Optional[bytes], str]]):
+        with self._write_transaction() as conn:
+            # Extract task_ids from the rows
+            task_ids = [task_id for _, _, _, task_id in rows]
+
             # Check if all task IDs exist in a single query
-            cursor = self.conn.execute('SELECT task_id FROM task_status WHERE task_id IN ({})'.format(','.join('?'*len(task_ids))), task_ids)
+            cursor = conn.execute('SELECT task_id FROM task_state WHERE task_id IN ({})'.format(','.join('?'*len(task_ids))), task_ids)
             existing_task_ids = {row[0] for row in cursor.fetchall()}
 
             # Raise KeyError if any task is missing
@@ -77,64 +247,90 @@ class SQLiteMemory(Memory):
                 if task_id not in existing_task_ids:
                     raise KeyError(f"Task {task_id} does not exist")
 
-            self.conn.executemany('''
-                UPDATE task_status SET status = ? WHERE task_id = ?
-            ''', [(status, task_id) for task_id, status, _, _ in statuses])
-
-            # TODO: Make this more optimized
-            for task_id, _, result, error in statuses:
-                if result is not None:
-                    self.conn.execute('''
-                        INSERT OR REPLACE INTO task_result (task_id, result) VALUES (?, ?)
-                    ''', (task_id, json.dumps(result)))
-                if error:
-                    self.conn.execute('''
-                        INSERT OR REPLACE INTO task_error (task_id, error) VALUES (?, ?)
-                    ''', (task_id, json.dumps(error)))
+            conn.executemany(_SQL_UPDATE_STATE, rows)
 
     def get_task_status(self, task_id: str) -> str:
-        cursor = self.conn.execute('SELECT status FROM task_status WHERE task_id = ?', (task_id,))
+        cursor = self._reader().execute(_SQL_GET_STATUS, (task_id,))
         result = cursor.fetchone()
         if result is None:
             raise KeyError(f"Task with ID {task_id} not found in the database.")
         return result[0]
 
-    def get_pending_tasks(self) -> List[str]:
-        cursor = self.conn.execute('SELECT task_id FROM task_status WHERE status = ?', ('pending',))
-        return [row[0] for row in cursor.fetchall()]
+    def get_pending_tasks(self, filter_ids: Optional[List[str]] = None) -> List[str]:
+        # With a filter, restrict server-side via the covering index instead of
+        # returning every pending id only for the caller to discard most of them
+        if filter_ids is not None:
+            conn = self._reader()
+            pending = []
+            for start in range(0, len(filter_ids), _MAX_IN_PARAMS):
+                chunk = filter_ids[start:start + _MAX_IN_PARAMS]
+                placeholders = ','.join('?' * len(chunk))
+                cursor = conn.execute(
+                    "SELECT task_id FROM task_state WHERE status = 'pending' AND task_id IN ({})".format(placeholders),
+                    chunk
+                )
+                pending.extend(itertools.chain.from_iterable(cursor))
+            return pending
+
+        # Serve repeated polls from the cache as long as no write has landed
+        # since it was built, skipping a table scan per call
+        cached = self._pending_cache
+        if cached is not None and cached[0] == self._version:
+            return list(cached[1])
+
+        # Capture the version before the query: a write racing with the read
+        # leaves the cache tagged with a stale version, forcing a refresh
+        version = self._version
+        cursor = self._reader().execute(_SQL_GET_BY_STATUS, ('pending',))
+        # Rows are 1-tuples, so flattening the cursor avoids indexing into a
+        # fresh tuple per row on large result sets
+        pending = list(itertools.chain.from_iterable(cursor))
+        self._pending_cache = (version, pending)
+        return list(pending)
+
+    def has_pending_tasks(self) -> bool:
+        # EXISTS probe on the covering index; stops at the first pending row
+        # instead of materializing the full id list
+        cursor = self._reader().execute("SELECT 1 FROM task_state WHERE status = 'pending' LIMIT 1")
+        return cursor.fetchone() is not None
 
     def get_completed_tasks(self) -> List[str]:
-        cursor = self.conn.execute('SELECT task_id FROM task_status WHERE status = ?', ('completed',))
-        return [row[0] for row in cursor.fetchall()]
+        cursor = self._reader().execute(_SQL_GET_BY_STATUS, ('completed',))
+        return list(itertools.chain.from_iterable(cursor))
 
     def get_failed_tasks(self) -> List[Tuple[str, str]]:
-        cursor = self.conn.execute('''
-            SELECT ts.task_id, te.error 
-            FROM task_status ts 
-            JOIN task_error te ON ts.task_id = te.task_id 
-            WHERE ts.status = 'failed'
-        ''')
-        return [(row[0], json.loads(row[1])) for row in cursor.fetchall()]
+        cursor = self._reader().execute(_SQL_GET_FAILED)
+        return [(row[0], _loads(row[1])) for row in cursor.fetchall()]
 
     def get_task_result(self, task_id: str) -> Optional[dict]:
-        cursor = self.conn.execute('SELECT result FROM task_result WHERE task_id = ?', (task_id,))
+        cursor = self._reader().execute(_SQL_GET_RESULT, (task_id,))
         result = cursor.fetchone()
-        return json.loads(result[0]) if result else None
+        return _loads(result[0]) if result and result[0] is not None else None
+
+    def checkpoint(self, mode: str = 'TRUNCATE'):
+        """
+        Copy the WAL back into the main database file so the log does not grow
+        without bound between autocheckpoints. TRUNCATE also resets the WAL to
+        zero bytes. No-op for in-memory databases, which have no WAL.
+        """
+        if self._is_memory:
+            return
+        if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+        with self.lock:
+            self._writer_conn.execute(f'PRAGMA wal_checkpoint({mode})')
 
     def clear(self):
-        with self.conn, self.lock:
-            self.conn.execute('DELETE FROM task_definition')
-            self.conn.execute('DELETE FROM task_status')
-            self.conn.execute('DELETE FROM task_result')
-            self.conn.execute('DELETE FROM task_error')
+        with self._write_transaction() as conn:
+            conn.execute('DELETE FROM task_definition')
+            conn.execute('DELETE FROM task_state')
 
     def clear_tasks(self, task_ids: List[str]):
-        with self.conn:
-            for task_id in task_ids:
-                self.conn.execute('DELETE FROM task_definition WHERE task_id = ?', (task_id,))
-                self.conn.execute('DELETE FROM task_status WHERE task_id = ?', (task_id,))
-                self.conn.execute('DELETE FROM task_result WHERE task_id = ?', (task_id,))
-                self.conn.execute('DELETE FROM task_error WHERE task_id = ?', (task_id,))
+        # One bulk DELETE per table instead of one statement per task per table
+        params = [(task_id,) for task_id in task_ids]
+        with self._write_transaction() as conn:
+            conn.executemany('DELETE FROM task_definition WHERE task_id = ?', params)
+            conn.executemany('DELETE FROM task_state WHERE task_id = ?', params)
 
     def dump_all(self) -> Dict[str, Dict[str, dict]]:
         tasks = {}
@@ -142,17 +338,22 @@ class SQLiteMemory(Memory):
         results = {}
         errors = {}
 
-        cursor = self.conn.execute('SELECT task_id, task_data FROM task_definition')
-        tasks = {row[0]: json.loads(row[1]) for row in cursor.fetchall()}
-
-        cursor = self.conn.execute('SELECT task_id, status FROM task_status')
-        statuses = {row[0]: row[1] for row in cursor.fetchall()}
-
-        cursor = self.conn.execute('SELECT task_id, result FROM task_result')
-        results = {row[0]: json.loads(row[1]) for row in cursor.fetchall()}
-
-        cursor = self.conn.execute('SELECT task_id, error FROM task_error')
-        errors = {row[0]: json.loads(row[1]) for row in cursor.fetchall()}
+        # One joined scan, streamed row by row instead of materializing
+        # intermediate fetchall lists per table
+        cursor = self._reader().execute('''
+            SELECT td.task_id, td.task_data, ts.status, ts.result, ts.error
+            FROM task_definition td
+            LEFT JOIN task_state ts ON td.task_id = ts.task_id
+        ''')
+        cursor.arraysize = 1000
+        for task_id, task_data, status, result, error in cursor:
+            tasks[task_id] = _loads(task_data)
+            if status is not None:
+                statuses[task_id] = status
+            if result is not None:
+                results[task_id] = _loads(result)
+            if error is not None:
+                errors[task_id] = _loads(error)
 
         return {
             "task_definitions": tasks,
@@ -12,14 +12,15 @@ setup(
     packages=find_packages(),  # Automatically finds all packages in the kofu directory
     include_package_data=True,  # Includes additional files like README and LICENSE
     install_requires=[
-        'tqdm'
+        'tqdm',
+        'msgpack'
     ],  # Add external dependencies here, e.g., 'requests'
     extras_require={
         'dev': [
             'pytest>=6.0',  # Adds pytest as a development dependency
         ],
     },
-    python_requires='>=3.6',  # Minimum Python version
+    python_requires='>=3.9',  # Minimum Python version (asyncio.to_thread, cancel_futures)
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
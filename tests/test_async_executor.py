@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from kofu import LocalAsyncExecutor
+
+# Async task definition for testing
+class ExampleAsyncTask:
+    def __init__(self, task_id, url, fail_times=0):
+        self.task_id = task_id
+        self.url = url
+        self.fail_times = fail_times
+        self.attempts = 0
+
+    def get_id(self):
+        return self.task_id
+
+    async def __call__(self):
+        await asyncio.sleep(0)
+        self.attempts += 1
+        if self.attempts <= self.fail_times:
+            raise ValueError(f"Simulated failure for {self.task_id}")
+        return f"Processed {self.url}"
+
+# Fixture to provide a fresh SQLiteMemory for each test
+@pytest.fixture
+def sqlite_memory():
+    from kofu.memory import SQLiteMemory
+    return SQLiteMemory(":memory:")  # Use in-memory SQLite for testing
+
+# Test single async task execution
+def test_single_async_task_execution(sqlite_memory):
+    task = ExampleAsyncTask("task_1", "http://example.com")
+    sqlite_memory.store_tasks([("task_1", {"url": "http://example.com"})])
+
+    executor = LocalAsyncExecutor(tasks=[task], memory=sqlite_memory, max_concurrency=1)
+    executor.run()
+
+    assert sqlite_memory.get_task_status("task_1") == "completed"
+    assert sqlite_memory.get_task_result("task_1") == "Processed http://example.com"
+
+# Test concurrent execution of multiple async tasks
+def test_multiple_async_tasks_execution(sqlite_memory):
+    tasks = [ExampleAsyncTask(f"task_{i}", f"http://example.com/{i}") for i in range(10)]
+    sqlite_memory.store_tasks([(task.get_id(), {"url": task.url}) for task in tasks])
+
+    executor = LocalAsyncExecutor(tasks=tasks, memory=sqlite_memory, max_concurrency=4)
+    executor.run()
+
+    assert sqlite_memory.get_pending_tasks() == []
+    assert len(sqlite_memory.get_completed_tasks()) == 10
+
+# Test that a failing async task is retried and then recorded as failed
+def test_async_task_failure_and_retry(sqlite_memory):
+    task = ExampleAsyncTask("task_1", "http://example.com", fail_times=5)
+    sqlite_memory.store_tasks([("task_1", {"url": "http://example.com"})])
+
+    executor = LocalAsyncExecutor(tasks=[task], memory=sqlite_memory, max_concurrency=1, retry=1)
+    executor.run()
+
+    assert task.attempts == 2  # Initial attempt plus one retry
+    assert sqlite_memory.get_task_status("task_1") == "failed"
+    failed_tasks = sqlite_memory.get_failed_tasks()
+    assert failed_tasks[0][0] == "task_1"
+    assert "ValueError" in failed_tasks[0][1]
+
+# Test that a retried async task can succeed
+def test_async_task_retry_success(sqlite_memory):
+    task = ExampleAsyncTask("task_1", "http://example.com", fail_times=1)
+    sqlite_memory.store_tasks([("task_1", {"url": "http://example.com"})])
+
+    executor = LocalAsyncExecutor(tasks=[task], memory=sqlite_memory, max_concurrency=1, retry=1)
+    executor.run()
+
+    assert sqlite_memory.get_task_status("task_1") == "completed"
+
+# Test stop condition halts execution and cancels remaining tasks
+def test_async_stop_condition(sqlite_memory):
+    tasks = [ExampleAsyncTask(f"task_{i}", f"http://example.com/{i}") for i in range(10)]
+    sqlite_memory.store_tasks([(task.get_id(), {"url": task.url}) for task in tasks])
+
+    def stop_after_first_completion():
+        return len(sqlite_memory.get_completed_tasks()) >= 1
+
+    executor = LocalAsyncExecutor(tasks=tasks, memory=sqlite_memory, max_concurrency=1, stop_all_when=stop_after_first_completion)
+    executor.run()
+
+    # Some tasks should remain pending because execution was halted
+    assert len(sqlite_memory.get_pending_tasks()) > 0
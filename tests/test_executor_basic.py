@@ -93,3 +93,35 @@ def test_skip_completed_tasks(sqlite_memory):
     assert sqlite_memory.get_task_status("task_1") == "completed"  # Should remain completed
     assert sqlite_memory.get_task_status("task_2") == "completed"  # Should be marked as completed now
     assert sqlite_memory.get_task_result("task_2") == "Processed http://example.org"
+
+# Test execution with a process pool for CPU-bound tasks
+def test_process_pool_execution(sqlite_memory):
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [ExampleTask(f"task_{i}", f"http://example.com/{i}") for i in range(3)]
+    sqlite_memory.store_tasks([(task.get_id(), {"url": task.url}) for task in tasks])
+
+    executor = LocalThreadedExecutor(tasks=tasks, memory=sqlite_memory, max_concurrency=2, executor_cls=ProcessPoolExecutor)
+    executor.run()
+
+    assert sorted(sqlite_memory.get_completed_tasks()) == [task.get_id() for task in tasks]
+    assert sqlite_memory.get_task_result("task_1") == "Processed http://example.com/1"
+
+# Test that the worker pool persists across run() invocations and closes cleanly
+def test_executor_pool_reuse_and_close(sqlite_memory):
+    tasks = [ExampleTask("task_1", "http://example.com")]
+    sqlite_memory.store_tasks([("task_1", {"url": "http://example.com"})])
+
+    with LocalThreadedExecutor(tasks=tasks, memory=sqlite_memory, max_concurrency=2) as executor:
+        executor.run()
+        pool = executor._executor
+
+        # A second run with new work reuses the same pool
+        executor.tasks.append(ExampleTask("task_2", "http://example.org"))
+        sqlite_memory.store_tasks([("task_2", {"url": "http://example.org"})])
+        executor.run()
+        assert executor._executor is pool
+
+    # Leaving the context shuts the pool down
+    assert executor._executor is None
+    assert sorted(sqlite_memory.get_completed_tasks()) == ["task_1", "task_2"]
@@ -203,8 +203,8 @@ def test_get_task_status_not_found(sqlite_memory):
         sqlite_memory.get_task_status("task_999")
 
 def test_store_task_with_invalid_data(sqlite_memory):
-    with pytest.raises(TypeError, match="Task data for task task_1 is not JSON serializable"):
-        sqlite_memory.store_tasks([("task_1", set([1, 2, 3]))])  # Sets are not JSON serializable
+    with pytest.raises(TypeError, match="Task data for task task_1 is not serializable"):
+        sqlite_memory.store_tasks([("task_1", set([1, 2, 3]))])  # Sets are not serializable
 
 def test_auto_create_directories_for_sqlite_memory(tmp_path):
     # Prepare a directory path inside tmp_path that doesn't exist yet
@@ -223,3 +223,55 @@ def test_auto_create_directories_for_sqlite_memory(tmp_path):
     # Optional: Verify that we can now interact with SQLiteMemory (store a task)
     memory.store_tasks([("task_1", {"data": "test"})])
     assert memory.get_task_status("task_1") == "pending"
+
+# Schema Migration
+
+def test_migration_from_legacy_schema(tmp_path):
+    import sqlite3
+
+    db_path = str(tmp_path / "legacy_tasks.db")
+
+    # Build a database using the old four-table schema
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute('CREATE TABLE task_definition (task_id TEXT PRIMARY KEY, task_data TEXT)')
+        conn.execute('CREATE TABLE task_status (task_id TEXT PRIMARY KEY, status TEXT)')
+        conn.execute('CREATE TABLE task_result (task_id TEXT PRIMARY KEY, result TEXT)')
+        conn.execute('CREATE TABLE task_error (task_id TEXT PRIMARY KEY, error TEXT)')
+        conn.execute('INSERT INTO task_definition VALUES (?, ?)', ("task_1", '{"url": "http://example.com"}'))
+        conn.execute('INSERT INTO task_definition VALUES (?, ?)', ("task_2", '{"url": "http://example.org"}'))
+        conn.execute('INSERT INTO task_status VALUES (?, ?)', ("task_1", "completed"))
+        conn.execute('INSERT INTO task_status VALUES (?, ?)', ("task_2", "failed"))
+        conn.execute('INSERT INTO task_result VALUES (?, ?)', ("task_1", '{"html": "<html>Task 1</html>"}'))
+        conn.execute('INSERT INTO task_error VALUES (?, ?)', ("task_2", '"TimeoutError"'))
+    conn.close()
+
+    # Opening the database migrates the legacy rows into task_state
+    memory = SQLiteMemory(db_path)
+    assert memory.get_task_status("task_1") == "completed"
+    assert memory.get_task_result("task_1") == {"html": "<html>Task 1</html>"}
+    assert memory.get_failed_tasks() == [("task_2", "TimeoutError")]
+
+def test_get_pending_tasks_with_filter(sqlite_memory):
+    tasks = [(f"task_{i}", {"url": f"http://example.com/{i}"}) for i in range(5)]
+    sqlite_memory.store_tasks(tasks)
+    sqlite_memory.update_task_statuses([("task_0", "completed", {"html": "<html>...</html>"}, None)])
+
+    pending = sqlite_memory.get_pending_tasks(filter_ids=["task_0", "task_1", "task_3", "task_999"])
+    assert sorted(pending) == ["task_1", "task_3"]
+
+def test_checkpoint(tmp_path):
+    memory = SQLiteMemory(str(tmp_path / "tasks.db"))
+    memory.store_tasks([("task_1", {"url": "http://example.com"})])
+    memory.checkpoint()  # Should not raise on a file-backed database
+    assert memory.get_task_status("task_1") == "pending"
+
+    with pytest.raises(ValueError):
+        memory.checkpoint(mode="BOGUS")
+
+def test_has_pending_tasks(sqlite_memory):
+    assert sqlite_memory.has_pending_tasks() is False
+    sqlite_memory.store_tasks([("task_1", {"url": "http://example.com"})])
+    assert sqlite_memory.has_pending_tasks() is True
+    sqlite_memory.update_task_statuses([("task_1", "completed", {"html": "<html>...</html>"}, None)])
+    assert sqlite_memory.has_pending_tasks() is False